@@ -0,0 +1 @@
+"""FastAPI backend package"""
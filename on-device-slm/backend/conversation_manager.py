@@ -4,10 +4,17 @@ Maintains chat history and context across multiple messages
 """
 
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from collections import deque, OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 import json
-import uuid
+import os
+import threading
+
+
+def _new_id() -> str:
+    """Generate a random opaque ID (32 hex chars, same entropy as UUID4)"""
+    return os.urandom(16).hex()
 
 
 @dataclass
@@ -22,15 +29,26 @@ class ChatMessage:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        data = asdict(self)
-        data['timestamp'] = self.timestamp.isoformat()
-        return data
+        return {
+            'id': self.id,
+            'role': self.role,
+            'content': self.content,
+            'timestamp': self.timestamp.isoformat(),
+            'token_count': self.token_count,
+            'metadata': self.metadata
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ChatMessage':
         """Create from dictionary"""
-        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
-        return cls(**data)
+        return cls(
+            id=data['id'],
+            role=data['role'],
+            content=data['content'],
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            token_count=data.get('token_count'),
+            metadata=data.get('metadata')
+        )
 
 
 @dataclass
@@ -45,6 +63,7 @@ class Conversation:
     total_tokens: int = 0
     max_tokens: int = 8192
     system_prompt: Optional[str] = None
+    trim_target: int = 0  # Precomputed token target for trimming (75% of max)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -63,17 +82,36 @@ class Conversation:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Conversation':
         """Create from dictionary"""
-        data['created_at'] = datetime.fromisoformat(data['created_at'])
-        data['updated_at'] = datetime.fromisoformat(data['updated_at'])
-        data['messages'] = [ChatMessage.from_dict(msg) for msg in data['messages']]
-        return cls(**data)
+        return cls(
+            id=data['id'],
+            title=data['title'],
+            model_id=data['model_id'],
+            messages=[ChatMessage.from_dict(msg) for msg in data['messages']],
+            created_at=datetime.fromisoformat(data['created_at']),
+            updated_at=datetime.fromisoformat(data['updated_at']),
+            total_tokens=data.get('total_tokens', 0),
+            max_tokens=data.get('max_tokens', 8192),
+            system_prompt=data.get('system_prompt')
+        )
 
 
 class ConversationManager:
     """Manages multiple conversations and their state"""
     
-    def __init__(self):
-        self.conversations: Dict[str, Conversation] = {}
+    def __init__(self, max_conversations: int = 1000):
+        # Ordered least-to-most recently used so eviction is O(1)
+        self.conversations: 'OrderedDict[str, Conversation]' = OrderedDict()
+        self.max_conversations = max_conversations
+        # Cached model-format message lists, keyed by conversation ID
+        self._model_view: Dict[str, List[Dict[str, str]]] = {}
+        # Shard locks so concurrent requests to different conversations
+        # never contend on a single global lock
+        self._locks = [threading.RLock() for _ in range(16)]
+        # Store lock for the OrderedDict itself: insert/evict/delete and
+        # move_to_end invalidate live iterators, so every order/structure
+        # mutation and every whole-store snapshot goes through this lock.
+        # Always acquired after a shard lock, never before.
+        self._store_lock = threading.RLock()
         self.default_system_prompt = """You are a helpful AI assistant running locally on the user's device. You are knowledgeable, friendly, and concise. You can help with a wide variety of tasks including:
 - Answering questions and providing information
 - Writing and creative tasks  
@@ -82,7 +120,11 @@ class ConversationManager:
 - General conversation
 
 Respond naturally and be helpful while being mindful of context length."""
-    
+
+    def _lock_for(self, conversation_id: str) -> threading.RLock:
+        """Get the shard lock guarding a conversation"""
+        return self._locks[hash(conversation_id) % len(self._locks)]
+
     def create_conversation(
         self, 
         model_id: str, 
@@ -91,7 +133,7 @@ Respond naturally and be helpful while being mindful of context length."""
         max_tokens: int = 8192
     ) -> str:
         """Create a new conversation and return its ID"""
-        conversation_id = str(uuid.uuid4())
+        conversation_id = _new_id()
         now = datetime.now()
         
         # Generate title if not provided
@@ -110,20 +152,31 @@ Respond naturally and be helpful while being mindful of context length."""
             created_at=now,
             updated_at=now,
             max_tokens=max_tokens,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            trim_target=int(max_tokens * 0.75)  # Use 75% of max
         )
         
         # Add system message if system prompt provided
+        model_view: List[Dict[str, str]] = []
         if system_prompt:
             system_message = ChatMessage(
-                id=str(uuid.uuid4()),
+                id=_new_id(),
                 role='system',
                 content=system_prompt,
                 timestamp=now
             )
             conversation.messages.append(system_message)
-        
-        self.conversations[conversation_id] = conversation
+            model_view.append({'role': 'system', 'content': system_prompt})
+
+        with self._store_lock:
+            # Evict the least recently used conversations once the cap is hit
+            while len(self.conversations) >= self.max_conversations:
+                evicted_id, _ = self.conversations.popitem(last=False)
+                self._model_view.pop(evicted_id, None)
+
+            self.conversations[conversation_id] = conversation
+            # Seed the model view up front so the chat path never has to rebuild it
+            self._model_view[conversation_id] = model_view
         return conversation_id
     
     def add_message(
@@ -139,74 +192,140 @@ Respond naturally and be helpful while being mindful of context length."""
             raise ValueError(f"Conversation {conversation_id} not found")
         
         conversation = self.conversations[conversation_id]
-        
+        now = datetime.now()
+
         message = ChatMessage(
-            id=str(uuid.uuid4()),
+            id=_new_id(),
             role=role,
             content=content,
-            timestamp=datetime.now(),
+            timestamp=now,
             token_count=token_count,
             metadata=metadata
         )
-        
-        conversation.messages.append(message)
-        conversation.updated_at = datetime.now()
-        
-        # Update total token count
-        if token_count:
-            conversation.total_tokens += token_count
-        
+
+        with self._lock_for(conversation_id):
+            conversation.messages.append(message)
+            conversation.updated_at = now
+            with self._store_lock:
+                self.conversations.move_to_end(conversation_id)
+
+            # Keep the cached model view in sync instead of rebuilding it later
+            cached_view = self._model_view.get(conversation_id)
+            if cached_view is not None:
+                cached_view.append({'role': role, 'content': content})
+
+            # Update total token count (branchless; token_count may be None)
+            conversation.total_tokens += token_count or 0
+
         return message
     
+    def add_messages(
+        self,
+        conversation_id: str,
+        messages: List[Dict[str, Any]]
+    ) -> List[ChatMessage]:
+        """Add several messages at once (bulk import / multi-turn replay)
+
+        Each entry needs 'role' and 'content', plus optional 'token_count'
+        and 'metadata'. One lock acquisition and one timestamp for the batch.
+        """
+        if conversation_id not in self.conversations:
+            raise ValueError(f"Conversation {conversation_id} not found")
+
+        conversation = self.conversations[conversation_id]
+        now = datetime.now()
+
+        new_messages = [
+            ChatMessage(
+                id=_new_id(),
+                role=entry['role'],
+                content=entry['content'],
+                timestamp=now,
+                token_count=entry.get('token_count'),
+                metadata=entry.get('metadata')
+            )
+            for entry in messages
+        ]
+
+        with self._lock_for(conversation_id):
+            conversation.messages.extend(new_messages)
+            conversation.updated_at = now
+            with self._store_lock:
+                self.conversations.move_to_end(conversation_id)
+
+            cached_view = self._model_view.get(conversation_id)
+            if cached_view is not None:
+                cached_view.extend(
+                    {'role': msg.role, 'content': msg.content} for msg in new_messages
+                )
+
+            conversation.total_tokens += sum(
+                msg.token_count or 0 for msg in new_messages
+            )
+
+        return new_messages
+
     def get_conversation_for_model(self, conversation_id: str) -> List[Dict[str, str]]:
         """Get conversation in format suitable for LLM (OpenAI-style)"""
         if conversation_id not in self.conversations:
             raise ValueError(f"Conversation {conversation_id} not found")
         
         conversation = self.conversations[conversation_id]
-        
-        # Convert to model format
-        model_messages = []
-        for message in conversation.messages:
-            model_messages.append({
-                'role': message.role,
-                'content': message.content
-            })
-        
+
+        # Convert to model format (cached; add_message appends incrementally)
+        model_messages = self._model_view.get(conversation_id)
+        if model_messages is None:
+            model_messages = [
+                {'role': message.role, 'content': message.content}
+                for message in conversation.messages
+            ]
+            self._model_view[conversation_id] = model_messages
+
         return model_messages
     
-    def trim_conversation(self, conversation_id: str, target_tokens: Optional[int] = None) -> int:
-        """Trim old messages to fit within token limits"""
+    def trim_conversation(self, conversation_id: str, target_tokens: Optional[int] = None):
+        """Trim old messages to fit within token limits
+
+        Returns (trimmed_count, model_history) so callers get the post-trim
+        history directly instead of re-fetching it.
+        """
         if conversation_id not in self.conversations:
             raise ValueError(f"Conversation {conversation_id} not found")
-        
+
         conversation = self.conversations[conversation_id]
-        
+
         if target_tokens is None:
-            target_tokens = conversation.max_tokens * 0.75  # Use 75% of max
-        
+            # Precomputed at creation; fall back for imported conversations
+            target_tokens = conversation.trim_target or int(conversation.max_tokens * 0.75)
+
         if conversation.total_tokens <= target_tokens:
-            return 0  # No trimming needed
-        
-        # Keep system message and recent messages
-        system_messages = [msg for msg in conversation.messages if msg.role == 'system']
-        other_messages = [msg for msg in conversation.messages if msg.role != 'system']
-        
-        # Remove oldest non-system messages until under target
-        trimmed_count = 0
-        current_tokens = conversation.total_tokens
-        
-        while current_tokens > target_tokens and len(other_messages) > 2:  # Keep at least last 2 messages
-            removed_message = other_messages.pop(0)
-            if removed_message.token_count:
-                current_tokens -= removed_message.token_count
-            trimmed_count += 1
-        
-        # Rebuild conversation
-        conversation.messages = system_messages + other_messages
-        conversation.total_tokens = current_tokens
-        
-        return trimmed_count
+            return 0, self.get_conversation_for_model(conversation_id)  # No trimming needed
+
+        with self._lock_for(conversation_id):
+            # Keep system message and recent messages
+            system_messages = [msg for msg in conversation.messages if msg.role == 'system']
+            other_messages = deque(msg for msg in conversation.messages if msg.role != 'system')
+
+            # Remove oldest non-system messages until under target
+            trimmed_count = 0
+            current_tokens = conversation.total_tokens
+
+            while current_tokens > target_tokens and len(other_messages) > 2:  # Keep at least last 2 messages
+                removed_message = other_messages.popleft()
+                if removed_message.token_count:
+                    current_tokens -= removed_message.token_count
+                trimmed_count += 1
+
+            # Rebuild conversation and the cached model view in one pass
+            conversation.messages = system_messages + list(other_messages)
+            conversation.total_tokens = current_tokens
+            model_messages = [
+                {'role': message.role, 'content': message.content}
+                for message in conversation.messages
+            ]
+            self._model_view[conversation_id] = model_messages
+
+        return trimmed_count, model_messages
     
     def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
         """Get a conversation by ID"""
@@ -214,6 +333,11 @@ Respond naturally and be helpful while being mindful of context length."""
     
     def list_conversations(self) -> List[Dict[str, Any]]:
         """List all conversations with basic info"""
+        # Snapshot under the store lock: a streaming thread's move_to_end
+        # would otherwise invalidate this iterator mid-listing. At the
+        # 1000-conversation cap the hold time is still negligible.
+        with self._store_lock:
+            conversations = list(reversed(self.conversations.values()))
         return [
             {
                 'id': conv.id,
@@ -223,14 +347,19 @@ Respond naturally and be helpful while being mindful of context length."""
                 'created_at': conv.created_at.isoformat(),
                 'updated_at': conv.updated_at.isoformat()
             }
-            for conv in sorted(self.conversations.values(), key=lambda x: x.updated_at, reverse=True)
+            # The store is kept in LRU order, so newest-first is just a
+            # reverse iteration - no per-call sort needed
+            for conv in conversations
         ]
     
     def delete_conversation(self, conversation_id: str) -> bool:
         """Delete a conversation"""
-        if conversation_id in self.conversations:
-            del self.conversations[conversation_id]
-            return True
+        with self._lock_for(conversation_id):
+            with self._store_lock:
+                if conversation_id in self.conversations:
+                    del self.conversations[conversation_id]
+                    self._model_view.pop(conversation_id, None)
+                    return True
         return False
     
     def update_conversation_title(self, conversation_id: str, title: str) -> bool:
@@ -238,6 +367,8 @@ Respond naturally and be helpful while being mindful of context length."""
         if conversation_id in self.conversations:
             self.conversations[conversation_id].title = title
             self.conversations[conversation_id].updated_at = datetime.now()
+            with self._store_lock:
+                self.conversations.move_to_end(conversation_id)
             return True
         return False
     
@@ -250,7 +381,9 @@ Respond naturally and be helpful while being mindful of context length."""
     def import_conversation(self, data: Dict[str, Any]) -> str:
         """Import conversation from JSON format"""
         conversation = Conversation.from_dict(data)
-        self.conversations[conversation.id] = conversation
+        with self._store_lock:
+            self.conversations[conversation.id] = conversation
+            self._model_view.pop(conversation.id, None)
         return conversation.id
 
 
@@ -3,37 +3,59 @@ FastAPI Backend for On-Device LLM Assistant
 Professional API server for local AI interactions
 """
 
+import asyncio
+
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from pydantic import BaseModel
 import uvicorn
+import json
+import os
 import sys
+import threading
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
-# Add parent directory to path for importing our existing modules
+# Add the project root to the path so the examples/config packages
+# import cleanly when running `python main.py` from this directory
 sys.path.append(str(Path(__file__).parent.parent))
-sys.path.append(str(Path(__file__).parent.parent / "config"))
 
 try:
     from examples.hello_world import OllamaClient
     from examples.style_training import StyleTrainer
     from examples.token_management import TokenManager
-    from model_manager import model_config, ModelConfig
+    from config.model_manager import get_model_config, ModelConfig
     from conversation_manager import conversation_manager, ChatMessage, Conversation
+    from response_cache import response_cache
 except ImportError as e:
     print(f"Warning: Could not import modules: {e}")
     # We'll create fallback implementations
 
+# Use orjson for response encoding when available (much faster than stdlib json)
+try:
+    import orjson  # noqa: F401 - required at runtime by ORJSONResponse
+    from fastapi.responses import ORJSONResponse
+    default_response_class = ORJSONResponse
+
+    def json_encode(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    default_response_class = JSONResponse
+    json_encode = json.dumps
+
 app = FastAPI(
     title="On-Device LLM Assistant API",
     description="Professional API for local language model interactions with style training",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=default_response_class
 )
 
 # Configure CORS for React frontend
@@ -45,19 +67,168 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# One fallback handler instead of an identical try/except in every endpoint;
+# unexpected errors become a 500 carrying the failing path
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request, exc):
+    return default_response_class(
+        {"detail": f"{request.url.path} failed: {exc}"},
+        status_code=500
+    )
+
 # Initialize AI services
 try:
     ollama_client = OllamaClient()
     style_trainer = StyleTrainer()
     token_manager = TokenManager()
     # Initialize model config manager
-    model_manager = model_config
+    model_manager = get_model_config()
     SERVICES_AVAILABLE = True
 except:
     SERVICES_AVAILABLE = False
     model_manager = None
     print("Warning: AI services not available. Running in demo mode.")
 
+# Short-lived cache of the Ollama probe so frontend polling bursts don't
+# each pay a round-trip to the Ollama server
+_OLLAMA_STATUS_TTL = 3.0
+_ollama_status_cache = {'expires': 0.0, 'running': False, 'names': [],
+                        'index': (set(), set())}
+
+def get_ollama_status():
+    """Return (is_running, model_names), cached for a few seconds"""
+    now = time.monotonic()
+    if now < _ollama_status_cache['expires']:
+        return _ollama_status_cache['running'], _ollama_status_cache['names']
+
+    # One round-trip covers both the liveness check and the model list
+    is_running, names = ollama_client.probe()
+
+    _ollama_status_cache['running'] = is_running
+    _ollama_status_cache['names'] = names
+    # Build the availability index once per refresh, not once per request
+    _ollama_status_cache['index'] = build_ollama_name_index(names)
+    _ollama_status_cache['expires'] = now + _OLLAMA_STATUS_TTL
+    return is_running, names
+
+_ollama_probe_lock = asyncio.Lock()
+
+async def get_ollama_status_async():
+    """Probe Ollama off the event loop, coalescing concurrent misses
+
+    Cache hits return immediately; on a miss, concurrent callers share a
+    single in-flight probe instead of each hitting Ollama.
+    """
+    if time.monotonic() < _ollama_status_cache['expires']:
+        return _ollama_status_cache['running'], _ollama_status_cache['names']
+    async with _ollama_probe_lock:
+        return await run_in_threadpool(get_ollama_status)
+
+def build_ollama_name_index(ollama_names: List[str]):
+    """Precompute lookup sets so availability checks are O(1) per model"""
+    exact = set(ollama_names)
+    bases = {name.split(':', 1)[0] for name in ollama_names}
+    return exact, bases
+
+def get_cached_name_index():
+    """Availability index matching the most recent Ollama probe"""
+    return _ollama_status_cache['index']
+
+def is_model_available(model_id: str, name_index) -> bool:
+    """Check if a configured model is available in Ollama"""
+    exact, bases = name_index
+
+    # Exact match, or the :latest tag of the same name
+    if model_id in exact or f"{model_id}:latest" in exact:
+        return True
+
+    # A bare id matches any installed tag of the same base name;
+    # a tagged id also matches an installed :latest of its base
+    base = model_id.split(':', 1)[0]
+    if ':' not in model_id:
+        return base in bases
+    return f"{base}:latest" in exact
+
+# Short-lived cache of fully built endpoint payloads: the frontend polls
+# health and model config, and rebuilding those bodies each poll is
+# wasted work on top of the (already cached) Ollama probe
+_ENDPOINT_CACHE_TTL = 2.0
+_endpoint_cache: Dict[str, tuple] = {}
+_endpoint_cache_lock = asyncio.Lock()
+
+async def cached_endpoint(key: str, loader):
+    """Return a cached payload for key, rebuilding via loader() after TTL"""
+    entry = _endpoint_cache.get(key)
+    if entry and time.monotonic() < entry[0]:
+        return entry[1]
+    async with _endpoint_cache_lock:
+        # Re-check: another request may have rebuilt while we waited
+        entry = _endpoint_cache.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+        value = await loader()
+        _endpoint_cache[key] = (time.monotonic() + _ENDPOINT_CACHE_TTL, value)
+        return value
+
+def invalidate_endpoint_cache():
+    """Drop cached payloads after a config mutation"""
+    _endpoint_cache.clear()
+
+# Cap concurrent generations so quick endpoints stay responsive while the
+# model is busy, and the single local backend isn't thrashed
+_generation_semaphore = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_GENERATIONS", "2")))
+
+async def run_generation_off_loop(func, *args):
+    """Run a blocking generation call in the threadpool, capped by semaphore"""
+    async with _generation_semaphore:
+        return await run_in_threadpool(func, *args)
+
+# Coalesce identical in-flight generation requests onto one model call
+_inflight_locks: Dict[str, threading.Lock] = {}
+_inflight_guard = threading.Lock()
+
+def coalesced_generate(cache_key: str, produce):
+    """Run produce() unless an identical request is already in flight
+
+    Concurrent requests with the same cache key wait for the first one to
+    finish and reuse its cached result instead of hitting the model again.
+    """
+    with _inflight_guard:
+        lock = _inflight_locks.setdefault(cache_key, threading.Lock())
+
+    try:
+        with lock:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            result = produce()
+            if result:
+                response_cache.put(cache_key, result)
+            return result
+    finally:
+        with _inflight_guard:
+            _inflight_locks.pop(cache_key, None)
+
+# Use a real tokenizer when available; the BPE runs in compiled code and
+# gives accurate counts, so trimming decisions stop over/under-shooting
+try:
+    import tiktoken
+    _token_encoding = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _token_encoding = None
+
+@lru_cache(maxsize=4096)
+def estimate_token_count(text: str) -> int:
+    """Count tokens (real tokenizer if installed, else 1 token ≈ 0.75 words)"""
+    if _token_encoding is not None:
+        return len(_token_encoding.encode(text))
+    return int(len(text.split()) / 0.75)
+
+# Shared role constants: interned once so every chat turn reuses the same
+# string objects instead of allocating/hashing fresh ones
+ROLE_USER = sys.intern("user")
+ROLE_ASSISTANT = sys.intern("assistant")
+
 # Pydantic models for API
 class ChatRequest(BaseModel):
     message: str
@@ -100,6 +271,9 @@ class StyleRequest(BaseModel):
     word_limit: int = 200
     model: str = "llama3.2:3b"
 
+class StyleBatchRequest(BaseModel):
+    items: List[StyleRequest]
+
 class StyleResponse(BaseModel):
     generated_text: str
     word_count: int
@@ -114,58 +288,52 @@ class HealthResponse(BaseModel):
     services_available: bool
     api_version: str
 
+# Constant demo-mode payloads, built once instead of per request
+_DEMO_HEALTH = HealthResponse(
+    status="demo_mode",
+    ollama_running=False,
+    available_models=[],
+    services_available=False,
+    api_version="1.0.0"
+)
+_DEMO_MODELS = {"models": ["llama3.2:3b", "llama3.2:1b"], "demo": True}
+_DEMO_MODELS_CONFIG = {
+    "available_models": [
+        {
+            "id": "llama3.2:3b",
+            "name": "Llama 3.2 3B (Demo)",
+            "description": "Demo mode - install Ollama for full functionality",
+            "category": "general",
+            "size_gb": 2.0,
+            "install_command": "ollama pull llama3.2:3b"
+        }
+    ],
+    "default_model": "llama3.2:3b",
+    "categories": {"general": {"name": "General Purpose", "description": "Demo models"}},
+    "demo": True
+}
+
 # API Routes
 @app.get("/api/health", response_model=HealthResponse)
 async def health_check():
     """Check API and Ollama service health"""
     if not SERVICES_AVAILABLE:
-        return HealthResponse(
-            status="demo_mode",
-            ollama_running=False,
-            available_models=[],
-            services_available=False,
-            api_version="1.0.0"
-        )
-    
-    try:
-        is_running = ollama_client.is_running()
-        ollama_models = ollama_client.list_models() if is_running else []
-        
-        # Get model names from ollama
-        ollama_model_names = [model['name'] if isinstance(model, dict) else str(model) for model in ollama_models]
-        
+        return _DEMO_HEALTH
+
+    async def _compute_health():
+        is_running, ollama_model_names = await get_ollama_status_async()
+
         # Use the same model availability logic as in /api/models/config
         # to return configured model IDs that are actually available
         available_configured_models = []
         if is_running:
-            # Helper function to check if a model is available in Ollama (same as in config endpoint)
-            def is_model_available(model_id: str, ollama_names: List[str]) -> bool:
-                # Check exact match first
-                if model_id in ollama_names:
-                    return True
-                
-                # Check with :latest suffix
-                if f"{model_id}:latest" in ollama_names:
-                    return True
-                
-                # Check if any ollama model starts with our model_id
-                for ollama_name in ollama_names:
-                    if ollama_name.startswith(f"{model_id}:"):
-                        return True
-                    # Also check the reverse - if model_id has a tag but ollama has :latest
-                    if ":" in model_id:
-                        base_name = model_id.split(":")[0]
-                        if ollama_name == f"{base_name}:latest":
-                            return True
-                
-                return False
-            
             # Get configured models and check which are available
+            name_index = get_cached_name_index()
             config = model_manager.export_frontend_config()
             for model in config["available_models"]:
-                if is_model_available(model["id"], ollama_model_names):
+                if is_model_available(model["id"], name_index):
                     available_configured_models.append(model["id"])
-        
+
         return HealthResponse(
             status="healthy" if is_running else "ollama_offline",
             ollama_running=is_running,
@@ -173,8 +341,8 @@ async def health_check():
             services_available=True,
             api_version="1.0.0"
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
+
+    return await cached_endpoint("health", _compute_health)
 
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat_completion(request: ChatRequest):
@@ -187,11 +355,11 @@ async def chat_completion(request: ChatRequest):
         )
         
         # Add user message to demo conversation
-        user_message = conversation_manager.add_message(conv_id, "user", request.message)
+        user_message = conversation_manager.add_message(conv_id, ROLE_USER, request.message)
         
         # Add demo assistant response
         demo_response = "Demo mode: This would be a response from your local Llama model. Install Ollama and restart to enable full functionality."
-        assistant_message = conversation_manager.add_message(conv_id, "assistant", demo_response, token_count=20)
+        assistant_message = conversation_manager.add_message(conv_id, ROLE_ASSISTANT, demo_response, token_count=20)
         
         return ChatResponse(
             response=demo_response,
@@ -203,83 +371,144 @@ async def chat_completion(request: ChatRequest):
             message_id=assistant_message.id
         )
     
-    try:
-        start_time = time.time()
-        
-        # Get or create conversation
-        conv_id = request.conversation_id
-        if not conv_id:
-            # Create new conversation
-            conv_id = conversation_manager.create_conversation(
-                model_id=request.model,
-                title=f"Chat with {request.model}"
-            )
-        
-        # Add user message to conversation
-        user_message = conversation_manager.add_message(conv_id, "user", request.message)
-        
-        # Get conversation history for model
-        conversation_history = conversation_manager.get_conversation_for_model(conv_id)
-        
-        # Check if we need to trim conversation
-        conversation = conversation_manager.get_conversation(conv_id)
-        if conversation and conversation.total_tokens > conversation.max_tokens * 0.8:
-            trimmed = conversation_manager.trim_conversation(conv_id)
-            if trimmed > 0:
-                print(f"Trimmed {trimmed} messages from conversation {conv_id}")
-                conversation_history = conversation_manager.get_conversation_for_model(conv_id)
-        
-        # Generate response using conversation context
+    start_time = time.time()
+
+    # Get or create conversation
+    conv_id = request.conversation_id
+    if not conv_id:
+        # Create new conversation
+        conv_id = conversation_manager.create_conversation(
+            model_id=request.model,
+            title=f"Chat with {request.model}"
+        )
+
+    # Add user message to conversation (counted up front so the running
+    # total stays accurate)
+    conversation_manager.add_message(
+        conv_id, ROLE_USER, request.message,
+        token_count=estimate_token_count(request.message)
+    )
+
+    # Get conversation history for model
+    conversation_history = conversation_manager.get_conversation_for_model(conv_id)
+
+    # Check if we need to trim conversation
+    conversation = conversation_manager.get_conversation(conv_id)
+    if conversation and conversation.total_tokens > conversation.max_tokens * 0.8:
+        # trim_conversation hands back the post-trim history directly
+        trimmed, conversation_history = conversation_manager.trim_conversation(conv_id)
+        if trimmed > 0:
+            print(f"Trimmed {trimmed} messages from conversation {conv_id}")
+
+    # Reuse a cached response if the exact same context was seen recently
+    cache_key = response_cache.make_key(request.model, conversation_history)
+
+    def run_generation():
         if len(conversation_history) == 1:
             # Single message, use simple generation
-            response_text = ollama_client.generate(request.model, request.message)
-        else:
-            # Multi-message conversation - use chat endpoint if available
-            try:
-                response_text = ollama_client.chat(request.model, conversation_history)
-            except AttributeError:
-                # Fallback to simple generation with last message only
-                response_text = ollama_client.generate(request.model, request.message)
-        
-        response_time = time.time() - start_time
-        word_count = len(response_text.split())
-        
-        # Estimate token counts (rough approximation: 1 token ≈ 0.75 words)
-        response_tokens = int(word_count / 0.75)
-        user_tokens = int(len(request.message.split()) / 0.75)
-        
-        # Add assistant response to conversation
-        assistant_message = conversation_manager.add_message(
-            conv_id, 
-            "assistant", 
-            response_text, 
-            token_count=response_tokens
+            return ollama_client.generate(request.model, request.message)
+        # Multi-message conversation - use chat endpoint if available
+        try:
+            return ollama_client.chat(request.model, conversation_history)
+        except AttributeError:
+            # Fallback to simple generation with last message only
+            return ollama_client.generate(request.model, request.message)
+
+    response_text = await run_generation_off_loop(coalesced_generate, cache_key, run_generation)
+
+    response_time = time.time() - start_time
+    word_count = len(response_text.split())
+
+    # Add assistant response to conversation
+    assistant_message = conversation_manager.add_message(
+        conv_id,
+        ROLE_ASSISTANT,
+        response_text,
+        token_count=estimate_token_count(response_text)
+    )
+
+    # Read the running total instead of summing every message
+    total_tokens = conversation.total_tokens
+    token_info = {
+        "estimated_tokens": total_tokens,
+        "context_limit": conversation.max_tokens,
+        "fits": total_tokens < conversation.max_tokens,
+        "usage_percent": round((total_tokens / conversation.max_tokens) * 100, 2)
+    }
+
+    return ChatResponse(
+        response=response_text,
+        token_info=token_info,
+        response_time=response_time,
+        word_count=word_count,
+        model_used=request.model,
+        conversation_id=conv_id,
+        message_id=assistant_message.id
+    )
+
+@app.post("/api/chat/stream")
+async def chat_completion_stream(request: ChatRequest):
+    """Stream a chat response chunk-by-chunk instead of buffering it"""
+    if not SERVICES_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Streaming not available in demo mode")
+
+    # Get or create conversation
+    conv_id = request.conversation_id
+    if not conv_id:
+        conv_id = conversation_manager.create_conversation(
+            model_id=request.model,
+            title=f"Chat with {request.model}"
         )
-        
-        # Update user message token count
-        user_message.token_count = user_tokens
-        
-        # Check total conversation tokens
-        total_tokens = sum(msg.token_count or 0 for msg in conversation.messages)
-        token_info = {
-            "estimated_tokens": total_tokens,
-            "context_limit": conversation.max_tokens,
-            "fits": total_tokens < conversation.max_tokens,
-            "usage_percent": round((total_tokens / conversation.max_tokens) * 100, 2)
+
+    conversation_manager.add_message(
+        conv_id, ROLE_USER, request.message,
+        token_count=estimate_token_count(request.message)
+    )
+    conversation_history = conversation_manager.get_conversation_for_model(conv_id)
+
+    def stream_response():
+        pieces = []
+        for piece in ollama_client.chat_stream(request.model, conversation_history):
+            pieces.append(piece)
+            yield f"data: {json_encode({'delta': piece})}\n\n"
+
+        # Record the full reply once streaming finishes
+        response_text = ''.join(pieces)
+        if response_text:
+            conversation_manager.add_message(
+                conv_id, ROLE_ASSISTANT, response_text,
+                token_count=estimate_token_count(response_text)
+            )
+
+        final_event = {
+            'done': True,
+            'conversation_id': conv_id,
+            'word_count': len(response_text.split())
         }
-        
-        return ChatResponse(
-            response=response_text,
-            token_info=token_info,
-            response_time=response_time,
-            word_count=word_count,
-            model_used=request.model,
-            conversation_id=conv_id,
-            message_id=assistant_message.id
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Chat generation failed: {str(e)}")
+        yield f"data: {json_encode(final_event)}\n\n"
+
+    return StreamingResponse(
+        stream_response(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Conversation-Id": conv_id
+        }
+    )
+
+def build_style_prompt(request: StyleRequest) -> str:
+    """Assemble the style-aware prompt from the request's examples"""
+    if not request.examples:
+        # Fallback to simple prompt
+        return f"Write about {request.prompt}. Write approximately {request.word_limit} words."
+
+    parts = ["Study these writing examples and then write in the same style:\n\n"]
+    for i, example in enumerate(request.examples[:3], 1):  # Limit to 3 examples
+        parts.append(f"EXAMPLE {i}:\n{example.strip()}\n\n")
+    parts.append(f"Now write in the same style for this topic: {request.prompt}\n\n")
+    parts.append(f"Write approximately {request.word_limit} words.\n\nRESPONSE:")
+    return "".join(parts)
 
 @app.post("/api/style", response_model=StyleResponse)
 async def style_generation(request: StyleRequest):
@@ -299,124 +528,115 @@ async def style_generation(request: StyleRequest):
             meets_word_limit=len(demo_text.split()) <= request.word_limit
         )
     
-    try:
-        start_time = time.time()
-        
-        # Create a style-aware prompt
-        if request.examples:
-            # Use user's examples for style training
-            style_prompt = "Study these writing examples and then write in the same style:\n\n"
-            for i, example in enumerate(request.examples[:3], 1):  # Limit to 3 examples
-                style_prompt += f"EXAMPLE {i}:\n{example.strip()}\n\n"
-            style_prompt += f"Now write in the same style for this topic: {request.prompt}\n\n"
-            style_prompt += f"Write approximately {request.word_limit} words.\n\nRESPONSE:"
-        else:
-            # Fallback to simple prompt
-            style_prompt = f"Write about {request.prompt}. Write approximately {request.word_limit} words."
-        
-        # Generate response using Ollama
-        response = ollama_client.generate(request.model, style_prompt)
-        generated_text = response if response else "Failed to generate response."
-        
-        response_time = time.time() - start_time
-        word_count = len(generated_text.split())
-        
-        # Analyze style elements
-        if request.examples:
-            # Analyze similarity to provided examples
-            style_analysis = f"Generated {word_count} words based on your {len(request.examples)} writing examples. "
-            style_analysis += "Style training applied successfully." if request.examples else "No examples provided for style reference."
-        else:
-            style_analysis = f"Generated {word_count} words without specific style examples."
-        
-        return StyleResponse(
-            generated_text=generated_text,
-            word_count=word_count,
-            style_analysis=style_analysis,
-            response_time=response_time,
-            meets_word_limit=word_count <= request.word_limit
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Style generation failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Style generation failed: {str(e)}")
+    return await generate_style_response(request)
+
+async def generate_style_response(request: StyleRequest) -> StyleResponse:
+    """Run one style generation and package the result"""
+    start_time = time.time()
+
+    style_prompt = build_style_prompt(request)
+
+    # Generate response using Ollama (off the event loop)
+    response = await run_generation_off_loop(ollama_client.generate, request.model, style_prompt)
+    generated_text = response if response else "Failed to generate response."
+
+    response_time = time.time() - start_time
+    word_count = len(generated_text.split())
+
+    # Analyze style elements
+    if request.examples:
+        # Analyze similarity to provided examples
+        style_analysis = f"Generated {word_count} words based on your {len(request.examples)} writing examples. "
+        style_analysis += "Style training applied successfully." if request.examples else "No examples provided for style reference."
+    else:
+        style_analysis = f"Generated {word_count} words without specific style examples."
+
+    return StyleResponse(
+        generated_text=generated_text,
+        word_count=word_count,
+        style_analysis=style_analysis,
+        response_time=response_time,
+        meets_word_limit=word_count <= request.word_limit
+    )
+
+@app.post("/api/style/batch", response_model=List[StyleResponse])
+async def style_generation_batch(request: StyleBatchRequest):
+    """Generate several style responses concurrently (bulk workloads)
+
+    Items run in parallel up to the generation semaphore / Ollama's own
+    OLLAMA_NUM_PARALLEL limit; the call returns when the slowest finishes.
+    """
+    if not SERVICES_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Batch generation not available in demo mode")
+    if not request.items:
+        return []
+
+    return await asyncio.gather(
+        *(generate_style_response(item) for item in request.items)
+    )
+
+@app.post("/api/style/stream")
+async def style_generation_stream(request: StyleRequest):
+    """Stream a style generation chunk-by-chunk instead of buffering it"""
+    if not SERVICES_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Streaming not available in demo mode")
+
+    style_prompt = build_style_prompt(request)
+
+    def stream_response():
+        pieces = []
+        for piece in ollama_client.generate_stream(request.model, style_prompt):
+            pieces.append(piece)
+            yield f"data: {json_encode({'delta': piece})}\n\n"
+
+        generated_text = ''.join(pieces)
+        final_event = {
+            'done': True,
+            'word_count': len(generated_text.split())
+        }
+        yield f"data: {json_encode(final_event)}\n\n"
+
+    return StreamingResponse(
+        stream_response(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
 
 @app.get("/api/models")
 async def get_available_models():
     """Get list of available Ollama models"""
     if not SERVICES_AVAILABLE:
-        return {"models": ["llama3.2:3b", "llama3.2:1b"], "demo": True}
-    
-    try:
-        models = ollama_client.list_models()
-        return {"models": models, "demo": False}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch models: {str(e)}")
+        return _DEMO_MODELS
+
+    return {"models": ollama_client.list_models(), "demo": False}
 
 @app.get("/api/models/config")
 async def get_model_configuration():
     """Get the complete model configuration for frontend"""
     if not SERVICES_AVAILABLE or not model_manager:
-        return {
-            "available_models": [
-                {
-                    "id": "llama3.2:3b",
-                    "name": "Llama 3.2 3B (Demo)",
-                    "description": "Demo mode - install Ollama for full functionality",
-                    "category": "general",
-                    "size_gb": 2.0,
-                    "install_command": "ollama pull llama3.2:3b"
-                }
-            ],
-            "default_model": "llama3.2:3b",
-            "categories": {"general": {"name": "General Purpose", "description": "Demo models"}},
-            "demo": True
-        }
-    
-    try:
+        return _DEMO_MODELS_CONFIG
+
+    async def _compute_model_configuration():
         # Get Ollama models to cross-reference availability
-        ollama_models = []
-        if ollama_client.is_running():
-            ollama_models = ollama_client.list_models()
-            ollama_model_names = [model['name'] if isinstance(model, dict) else str(model) for model in ollama_models]
-        else:
-            ollama_model_names = []
-        
+        _, ollama_model_names = await get_ollama_status_async()
+
         # Get configured models and mark which are available
         config = model_manager.export_frontend_config()
-        
-        # Helper function to check if a model is available in Ollama
-        def is_model_available(model_id: str, ollama_names: List[str]) -> bool:
-            # Check exact match first
-            if model_id in ollama_names:
-                return True
-            
-            # Check with :latest suffix
-            if f"{model_id}:latest" in ollama_names:
-                return True
-            
-            # Check if any ollama model starts with our model_id
-            for ollama_name in ollama_names:
-                if ollama_name.startswith(f"{model_id}:"):
-                    return True
-                # Also check the reverse - if model_id has a tag but ollama has :latest
-                if ":" in model_id:
-                    base_name = model_id.split(":")[0]
-                    if ollama_name == f"{base_name}:latest":
-                        return True
-            
-            return False
-        
+
         # Add availability status to each model
+        name_index = get_cached_name_index()
         for model in config["available_models"]:
-            model["available"] = is_model_available(model["id"], ollama_model_names)
-        
+            model["available"] = is_model_available(model["id"], name_index)
+
         config["demo"] = False
         config["ollama_models"] = ollama_model_names
-        
+
         return config
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get model config: {str(e)}")
+
+    return await cached_endpoint("models_config", _compute_model_configuration)
 
 @app.post("/api/models/config/default")
 async def set_default_model(request: dict):
@@ -428,14 +648,10 @@ async def set_default_model(request: dict):
     if not model_id:
         raise HTTPException(status_code=400, detail="model_id is required")
     
-    try:
-        success = model_manager.set_default_model(model_id)
-        if success:
-            return {"success": True, "default_model": model_id}
-        else:
-            raise HTTPException(status_code=404, detail="Model not found")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to set default model: {str(e)}")
+    if model_manager.set_default_model(model_id):
+        invalidate_endpoint_cache()
+        return {"success": True, "default_model": model_id}
+    raise HTTPException(status_code=404, detail="Model not found")
 
 @app.post("/api/models/config/enable")
 async def enable_model(request: dict):
@@ -447,14 +663,10 @@ async def enable_model(request: dict):
     if not model_id:
         raise HTTPException(status_code=400, detail="model_id is required")
     
-    try:
-        success = model_manager.enable_model(model_id)
-        if success:
-            return {"success": True, "model_id": model_id, "enabled": True}
-        else:
-            raise HTTPException(status_code=404, detail="Model not found")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to enable model: {str(e)}")
+    if model_manager.enable_model(model_id):
+        invalidate_endpoint_cache()
+        return {"success": True, "model_id": model_id, "enabled": True}
+    raise HTTPException(status_code=404, detail="Model not found")
 
 @app.post("/api/models/config/disable")
 async def disable_model(request: dict):
@@ -466,14 +678,10 @@ async def disable_model(request: dict):
     if not model_id:
         raise HTTPException(status_code=400, detail="model_id is required")
     
-    try:
-        success = model_manager.disable_model(model_id)
-        if success:
-            return {"success": True, "model_id": model_id, "enabled": False}
-        else:
-            raise HTTPException(status_code=404, detail="Model not found")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to disable model: {str(e)}")
+    if model_manager.disable_model(model_id):
+        invalidate_endpoint_cache()
+        return {"success": True, "model_id": model_id, "enabled": False}
+    raise HTTPException(status_code=404, detail="Model not found")
 
 @app.post("/api/models/config/add")
 async def add_model(request: dict):
@@ -497,43 +705,51 @@ async def add_model(request: dict):
         
         success = model_manager.add_model(model_config_data)
         if success:
+            invalidate_endpoint_cache()
             return {"success": True, "model": model_config_data.id}
         else:
             raise HTTPException(status_code=409, detail="Model already exists or failed to add")
     except KeyError as e:
         raise HTTPException(status_code=400, detail=f"Missing required field: {str(e)}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to add model: {str(e)}")
-
-# Mount static files for React frontend
-frontend_build_path = Path(__file__).parent.parent / "frontend" / "build"
-if frontend_build_path.exists():
-    app.mount("/static", StaticFiles(directory=frontend_build_path / "static"), name="static")
-
-# Serve React frontend (when built)
-@app.get("/")
-async def serve_frontend():
-    """Serve React frontend or fallback page"""
-    frontend_path = Path(__file__).parent.parent / "frontend" / "build" / "index.html"
-    
-    if frontend_path.exists():
-        return FileResponse(frontend_path)
-    else:
-        # Return simple status page
-        return HTMLResponse(content=f"""
+
+# Frontend build artifacts, resolved and stat'd once at import time
+FRONTEND_BUILD_PATH = Path(__file__).parent.parent / "frontend" / "build"
+FRONTEND_INDEX_PATH = FRONTEND_BUILD_PATH / "index.html"
+FRONTEND_INDEX_EXISTS = FRONTEND_INDEX_PATH.exists()
+
+class SPAStaticFiles(StaticFiles):
+    """StaticFiles that serves index.html for unknown non-API paths
+
+    Assets are served straight from the build directory; anything the
+    router doesn't know (React Router client-side routes) falls back to
+    the SPA shell, while unknown /api/ paths stay hard 404s.
+    """
+
+    async def get_response(self, path: str, scope):
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as exc:
+            # StaticFiles raises for missing files rather than returning
+            # a 404 response; treat that as "not an asset, serve the shell"
+            if exc.status_code == 404 and not path.startswith("api/"):
+                return await super().get_response("index.html", scope)
+            raise
+
+# Fallback status page, encoded to bytes once at import time instead of per request
+FALLBACK_PAGE_BYTES = """
         <!DOCTYPE html>
         <html>
         <head>
             <title>On-Device LLM Assistant</title>
             <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; 
-                       margin: 0; padding: 40px; background: #f5f5f5; }}
-                .container {{ max-width: 800px; margin: 0 auto; background: white; 
-                            padding: 40px; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.1); }}
-                .status {{ background: #e8f5e8; padding: 20px; border-radius: 8px; margin: 20px 0; }}
-                .api-link {{ display: inline-block; margin: 10px; padding: 12px 24px; 
-                           background: #007acc; color: white; text-decoration: none; border-radius: 6px; }}
-                .api-link:hover {{ background: #005999; }}
+                body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+                       margin: 0; padding: 40px; background: #f5f5f5; }
+                .container { max-width: 800px; margin: 0 auto; background: white;
+                            padding: 40px; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.1); }
+                .status { background: #e8f5e8; padding: 20px; border-radius: 8px; margin: 20px 0; }
+                .api-link { display: inline-block; margin: 10px; padding: 12px 24px;
+                           background: #007acc; color: white; text-decoration: none; border-radius: 6px; }
+                .api-link:hover { background: #005999; }
             </style>
         </head>
         <body>
@@ -547,7 +763,7 @@ async def serve_frontend():
                 <a href="/api/docs" class="api-link">📖 API Documentation</a>
                 <a href="/api/health" class="api-link">🏥 Health Check</a>
                 <a href="/api/models" class="api-link">🤖 Available Models</a>
-                
+
                 <h3>🔧 Next Steps:</h3>
                 <ol>
                     <li>Create React frontend: <code>cd frontend && npm create react-app .</code></li>
@@ -557,157 +773,133 @@ async def serve_frontend():
             </div>
         </body>
         </html>
-        """)
+        """.encode('utf-8')
+
+# Fallback status page while the frontend isn't built (the built SPA is
+# served by the mount registered after all API routes, below)
+if not FRONTEND_INDEX_EXISTS:
+    @app.get("/")
+    async def serve_frontend():
+        """Serve a simple status page until the React build exists"""
+        return HTMLResponse(content=FALLBACK_PAGE_BYTES)
 
 # ==================== CONVERSATION MANAGEMENT ENDPOINTS ====================
 
 @app.post("/api/conversations", response_model=ConversationResponse)
 async def create_conversation(request: ConversationCreateRequest):
     """Create a new conversation"""
-    try:
-        conversation_id = conversation_manager.create_conversation(
-            model_id=request.model_id,
-            title=request.title,
-            system_prompt=request.system_prompt,
-            max_tokens=request.max_tokens
-        )
-        
-        conversation = conversation_manager.get_conversation(conversation_id)
-        if not conversation:
-            raise HTTPException(status_code=500, detail="Failed to create conversation")
-        
-        return ConversationResponse(
-            id=conversation.id,
-            title=conversation.title,
-            model_id=conversation.model_id,
-            message_count=len(conversation.messages),
-            created_at=conversation.created_at.isoformat(),
-            updated_at=conversation.updated_at.isoformat()
-        )
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create conversation: {str(e)}")
+    conversation_id = conversation_manager.create_conversation(
+        model_id=request.model_id,
+        title=request.title,
+        system_prompt=request.system_prompt,
+        max_tokens=request.max_tokens
+    )
+
+    conversation = conversation_manager.get_conversation(conversation_id)
+    if not conversation:
+        raise HTTPException(status_code=500, detail="Failed to create conversation")
+
+    return ConversationResponse(
+        id=conversation.id,
+        title=conversation.title,
+        model_id=conversation.model_id,
+        message_count=len(conversation.messages),
+        created_at=conversation.created_at.isoformat(),
+        updated_at=conversation.updated_at.isoformat()
+    )
 
 @app.get("/api/conversations", response_model=List[ConversationResponse])
 async def list_conversations():
     """List all conversations"""
-    try:
-        conversations = conversation_manager.list_conversations()
-        return [
-            ConversationResponse(
-                id=conv['id'],
-                title=conv['title'],
-                model_id=conv['model_id'],
-                message_count=conv['message_count'],
-                created_at=conv['created_at'],
-                updated_at=conv['updated_at']
-            )
-            for conv in conversations
-        ]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list conversations: {str(e)}")
+    conversations = conversation_manager.list_conversations()
+    # model_construct skips re-validation of data we just built ourselves
+    return [ConversationResponse.model_construct(**conv) for conv in conversations]
 
 @app.get("/api/conversations/{conversation_id}")
 async def get_conversation(conversation_id: str):
     """Get a specific conversation with all messages"""
-    try:
-        conversation = conversation_manager.get_conversation(conversation_id)
-        if not conversation:
-            raise HTTPException(status_code=404, detail="Conversation not found")
-        
-        return {
-            "id": conversation.id,
-            "title": conversation.title,
-            "model_id": conversation.model_id,
-            "created_at": conversation.created_at.isoformat(),
-            "updated_at": conversation.updated_at.isoformat(),
-            "total_tokens": conversation.total_tokens,
-            "max_tokens": conversation.max_tokens,
-            "system_prompt": conversation.system_prompt,
-            "messages": [
-                MessageResponse(
-                    id=msg.id,
-                    role=msg.role,
-                    content=msg.content,
-                    timestamp=msg.timestamp.isoformat(),
-                    token_count=msg.token_count
-                )
-                for msg in conversation.messages
-            ]
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get conversation: {str(e)}")
+    conversation = conversation_manager.get_conversation(conversation_id)
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    return {
+        "id": conversation.id,
+        "title": conversation.title,
+        "model_id": conversation.model_id,
+        "created_at": conversation.created_at.isoformat(),
+        "updated_at": conversation.updated_at.isoformat(),
+        "total_tokens": conversation.total_tokens,
+        "max_tokens": conversation.max_tokens,
+        "system_prompt": conversation.system_prompt,
+        "messages": [
+            MessageResponse.model_construct(
+                id=msg.id,
+                role=msg.role,
+                content=msg.content,
+                timestamp=msg.timestamp.isoformat(),
+                token_count=msg.token_count
+            )
+            for msg in conversation.messages
+        ]
+    }
 
 @app.delete("/api/conversations/{conversation_id}")
 async def delete_conversation(conversation_id: str):
     """Delete a conversation"""
-    try:
-        if conversation_manager.delete_conversation(conversation_id):
-            return {"message": "Conversation deleted successfully"}
-        else:
-            raise HTTPException(status_code=404, detail="Conversation not found")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to delete conversation: {str(e)}")
+    if conversation_manager.delete_conversation(conversation_id):
+        return {"message": "Conversation deleted successfully"}
+    raise HTTPException(status_code=404, detail="Conversation not found")
 
 @app.put("/api/conversations/{conversation_id}/title")
 async def update_conversation_title(conversation_id: str, title: Dict[str, str]):
     """Update conversation title"""
-    try:
-        if conversation_manager.update_conversation_title(conversation_id, title["title"]):
-            return {"message": "Title updated successfully"}
-        else:
-            raise HTTPException(status_code=404, detail="Conversation not found")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to update title: {str(e)}")
+    if conversation_manager.update_conversation_title(conversation_id, title["title"]):
+        return {"message": "Title updated successfully"}
+    raise HTTPException(status_code=404, detail="Conversation not found")
 
 @app.get("/api/conversations/{conversation_id}/export")
 async def export_conversation(conversation_id: str):
     """Export conversation to JSON"""
-    try:
-        conversation_data = conversation_manager.export_conversation(conversation_id)
-        if not conversation_data:
-            raise HTTPException(status_code=404, detail="Conversation not found")
-        
-        return conversation_data
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to export conversation: {str(e)}")
+    conversation_data = conversation_manager.export_conversation(conversation_id)
+    if not conversation_data:
+        raise HTTPException(status_code=404, detail="Conversation not found")
 
-# ==================== END CONVERSATION ENDPOINTS ====================
+    return conversation_data
 
-# Catch-all route for React Router (SPA support)
-@app.get("/{path:path}")
-async def serve_react_app(path: str):
-    """Serve React app for all routes (SPA routing support)"""
-    frontend_path = Path(__file__).parent.parent / "frontend" / "build" / "index.html"
-    
-    if frontend_path.exists():
-        return FileResponse(frontend_path)
-    else:
-        # Redirect to main page if React build doesn't exist
-        return await serve_frontend()
+# ==================== END CONVERSATION ENDPOINTS ====================
 
-# Mount static files when React build exists
-frontend_static = Path(__file__).parent.parent / "frontend" / "build" / "static"
-if frontend_static.exists():
-    app.mount("/static", StaticFiles(directory=frontend_static), name="static")
+# Serve the React build for everything the API routes above didn't match;
+# registered last so /api/* keeps precedence
+if FRONTEND_INDEX_EXISTS:
+    app.mount("/", SPAStaticFiles(directory=FRONTEND_BUILD_PATH, html=True), name="spa")
 
 if __name__ == "__main__":
     print("🚀 Starting On-Device LLM Assistant API...")
     print("📖 API Documentation: http://localhost:8000/api/docs")
     print("🏥 Health Check: http://localhost:8000/api/health")
     
-    uvicorn.run(
-        "main:app",
-        host="127.0.0.1",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    # uvicorn[standard] ships uvloop/httptools and picks them automatically
+    # where supported (uvloop is unavailable on Windows).
+    host = os.getenv("HOST", "127.0.0.1")
+    port = int(os.getenv("PORT", "8000"))
+
+    if os.getenv("RELOAD", "").lower() in ("1", "true", "yes"):
+        # Development: auto-reload, single worker
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            reload=True,
+            log_level=os.getenv("LOG_LEVEL", "debug")
+        )
+    else:
+        # Production: no reload, quieter logs, workers via WEB_CONCURRENCY
+        # (keep 1 unless conversation state moves out of process - see
+        # the scaling note in ARCHITECTURE.md)
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            log_level=os.getenv("LOG_LEVEL", "warning")
+        )
@@ -0,0 +1,68 @@
+"""
+Response Cache for On-Device LLM Assistant
+Avoids re-running the model when an identical conversation context repeats
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class ResponseCache:
+    """Bounded TTL cache keyed by model + conversation context"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]]) -> str:
+        """Hash the model name and full message chain into a cache key
+
+        Message content is whitespace-normalized so trivial variants of
+        the same prompt (trailing newline, double spaces) share an entry.
+        """
+        hasher = hashlib.sha1()
+        hasher.update(model.encode('utf-8'))
+        for message in messages:
+            hasher.update(b'\x00')
+            hasher.update(message['role'].encode('utf-8'))
+            hasher.update(b'\x01')
+            hasher.update(' '.join(message['content'].split()).encode('utf-8'))
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        response, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response, evicting the oldest entries beyond the cap"""
+        self._entries[key] = (response, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        self._entries.clear()
+
+
+# Global response cache instance
+response_cache = ResponseCache()
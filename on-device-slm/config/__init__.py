@@ -0,0 +1 @@
+"""Model and training configuration"""
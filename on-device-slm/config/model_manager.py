@@ -4,10 +4,18 @@ Centralized configuration for available language models
 """
 
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+# Optional: orjson serializes this config shape much faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 @dataclass
 class ModelConfig:
@@ -33,10 +41,19 @@ class ModelConfigManager:
         
         self.config_path = config_path
         self._config_data = None
+        # Memoized views, rebuilt lazily after any config change
+        self._enabled_cache = None
+        self._frontend_cache = None
         self.load_config()
     
+    def _invalidate_caches(self) -> None:
+        """Drop memoized views after the config data changes"""
+        self._enabled_cache = None
+        self._frontend_cache = None
+
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from JSON file"""
+        self._invalidate_caches()
         try:
             with open(self.config_path, 'r') as f:
                 self._config_data = json.load(f)
@@ -50,12 +67,21 @@ class ModelConfigManager:
     
     def save_config(self) -> bool:
         """Save current configuration to JSON file"""
+        self._invalidate_caches()
         try:
             # Ensure config directory exists
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(self.config_path, 'w') as f:
-                json.dump(self._config_data, f, indent=2)
+
+            if orjson is not None:
+                payload = orjson.dumps(self._config_data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(self._config_data, indent=2).encode('utf-8')
+
+            # Write to a sibling temp file and atomically swap it in, so a
+            # crash mid-write can never leave a truncated config behind
+            tmp_path = self.config_path.with_name(self.config_path.name + '.tmp')
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self.config_path)
             return True
         except Exception as e:
             print(f"Failed to save config: {e}")
@@ -89,8 +115,10 @@ class ModelConfigManager:
         return models
     
     def get_enabled_models(self) -> List[ModelConfig]:
-        """Get only enabled models"""
-        return self.get_available_models(enabled_only=True)
+        """Get only enabled models (memoized until the config changes)"""
+        if self._enabled_cache is None:
+            self._enabled_cache = self.get_available_models(enabled_only=True)
+        return list(self._enabled_cache)
     
     def get_model_by_id(self, model_id: str) -> Optional[ModelConfig]:
         """Get a specific model by ID"""
@@ -203,24 +231,34 @@ class ModelConfigManager:
         }
     
     def export_frontend_config(self) -> Dict[str, Any]:
-        """Export configuration for frontend use"""
-        models = self.get_enabled_models()
+        """Export configuration for frontend use (memoized until the config changes)"""
+        if self._frontend_cache is None:
+            self._frontend_cache = {
+                "available_models": [
+                    {
+                        "id": model.id,
+                        "name": model.name,
+                        "description": model.description,
+                        "category": model.category,
+                        "size_gb": model.size_gb,
+                        "install_command": model.install_command
+                    }
+                    for model in self.get_enabled_models()
+                ],
+                "default_model": self.get_default_model(),
+                "categories": self.get_categories()
+            }
+        # Callers annotate the export (availability flags etc.), so hand
+        # out per-model copies instead of the cached dicts themselves
+        cached = self._frontend_cache
         return {
-            "available_models": [
-                {
-                    "id": model.id,
-                    "name": model.name,
-                    "description": model.description,
-                    "category": model.category,
-                    "size_gb": model.size_gb,
-                    "install_command": model.install_command
-                }
-                for model in models
-            ],
-            "default_model": self.get_default_model(),
-            "categories": self.get_categories()
+            "available_models": [dict(model) for model in cached["available_models"]],
+            "default_model": cached["default_model"],
+            "categories": cached["categories"]
         }
 
 
-# Global instance for easy access
-model_config = ModelConfigManager()
+@lru_cache(maxsize=1)
+def get_model_config() -> ModelConfigManager:
+    """Shared manager instance, created (and the JSON parsed) on first use"""
+    return ModelConfigManager()
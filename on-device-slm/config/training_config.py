@@ -3,6 +3,8 @@ Advanced Style Training Configuration
 Provides different training approaches and model fine-tuning options
 """
 
+import re
+
 # Fine-tuning approach using Unsloth (LoRA)
 FINE_TUNING_CONFIG = {
     "model_name": "unsloth/llama-3.2-3b-bnb-4bit",
@@ -48,17 +50,23 @@ STYLE_METRICS = [
     "rhetorical_devices"
 ]
 
-# Training data preparation
+# Training data preparation (patterns compiled once at import so
+# consumers don't pay per-call regex compilation)
 DATA_PREPARATION = {
     "min_text_length": 100,
     "max_text_length": 2000,
     "clean_patterns": [
-        r'\s+',  # Multiple whitespace
-        r'[^\w\s\.\!\?\,\;\:\-\(\)]',  # Non-standard characters
+        re.compile(r'\s+'),  # Multiple whitespace
+        re.compile(r'[^\w\s\.\!\?\,\;\:\-\(\)]'),  # Non-standard characters
     ],
     "format_template": "### Instruction:\nWrite in the style of the given examples.\n\n### Input:\n{examples}\n\n### Response:\n{response}"
 }
 
+def clean_text(text: str) -> str:
+    """Apply the data-preparation cleaning patterns to one text"""
+    text = DATA_PREPARATION["clean_patterns"][1].sub('', text)
+    return DATA_PREPARATION["clean_patterns"][0].sub(' ', text).strip()
+
 def get_training_approach_info():
     """Return information about different training approaches"""
     return {
@@ -0,0 +1 @@
+"""AI client example modules (Ollama client, style training, token management)"""
@@ -2,15 +2,44 @@
 Simple Ollama Hello World Test
 """
 
+import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
 
+# Optional: orjson en/decodes the generate payloads noticeably faster
+# than stdlib json once prompts grow to a few kB
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+    _loads = json.loads
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
 
 class OllamaClient:
     """Simple Ollama client with token management"""
     
-    def __init__(self, base_url="http://localhost:11434"):
+    def __init__(self, base_url="http://localhost:11434", keep_alive="5m"):
         self.base_url = base_url
+        # One session for all calls: connections to Ollama are kept alive
+        # instead of paying TCP setup per request
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+        # Keep the model loaded between requests so Ollama can reuse its
+        # KV cache for the shared system-prompt/conversation prefix
+        self.keep_alive = keep_alive
+        # Last /api/tags result, kept briefly so is_running/list_models
+        # back to back don't refetch the same payload
+        self._tags_cache = (0.0, None)
         self.model_limits = {
             "llama3.2:3b": 8192,
             "llama3.2:1b": 8192, 
@@ -19,56 +48,143 @@ class OllamaClient:
             "mistral:7b": 8192,
         }
     
-    def is_running(self):
-        """Check if Ollama service is running"""
+    def _fetch_tags(self, timeout=5):
+        """Fetch /api/tags with a short-lived cache
+
+        Returns the parsed model list, or None when the service is down;
+        consecutive liveness/model checks share one round-trip.
+        """
+        expires, cached = self._tags_cache
+        if time.monotonic() < expires:
+            return cached
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=timeout)
+            models = _loads(response.content).get('models', []) if response.status_code == 200 else None
         except requests.RequestException:
-            return False
-    
+            models = None
+        self._tags_cache = (time.monotonic() + 2.0, models)
+        return models
+
+    def is_running(self):
+        """Check if Ollama service is running"""
+        return self._fetch_tags() is not None
+
     def list_models(self):
         """Get available models"""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags")
-            return response.json().get('models', []) if response.status_code == 200 else []
-        except requests.RequestException:
-            return []
-    
+        models = self._fetch_tags()
+        return models if models is not None else []
+
+    def probe(self):
+        """Check service and fetch model names in one /api/tags round-trip
+
+        Returns (is_running, model_names) - callers that need both should
+        use this instead of is_running() + list_models() back to back.
+        """
+        models = self._fetch_tags()
+        if models is None:
+            return False, []
+        return True, [model['name'] if isinstance(model, dict) else str(model)
+                      for model in models]
+
+    def list_model_names(self):
+        """Get available model names as a flat list of strings"""
+        names = []
+        for model in self.list_models():
+            names.append(model['name'] if isinstance(model, dict) else str(model))
+        return names
+
     def generate(self, model, prompt, timeout=60):
         """Generate text using Ollama model"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
-                json={"model": model, "prompt": prompt, "stream": False},
+                data=_dumps({"model": model, "prompt": prompt, "stream": False,
+                             "keep_alive": self.keep_alive}),
+                headers=_JSON_HEADERS,
                 timeout=timeout
             )
-            return response.json().get('response', '') if response.status_code == 200 else None
+            return _loads(response.content).get('response', '') if response.status_code == 200 else None
         except requests.RequestException:
             return None
     
     def chat(self, model, messages, timeout=60):
         """Generate chat response with conversation history"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/chat",
-                json={"model": model, "messages": messages, "stream": False},
+                data=_dumps({"model": model, "messages": messages, "stream": False,
+                             "keep_alive": self.keep_alive}),
+                headers=_JSON_HEADERS,
                 timeout=timeout
             )
             if response.status_code == 200:
-                return response.json().get('message', {}).get('content', '')
+                return _loads(response.content).get('message', {}).get('content', '')
             return None
         except requests.RequestException:
             return None
     
+    def generate_stream(self, model, prompt, timeout=60):
+        """Yield response text chunks as Ollama generates them"""
+        try:
+            with self.session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": model, "prompt": prompt, "stream": True,
+                      "keep_alive": self.keep_alive},
+                timeout=timeout,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    return
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    piece = chunk.get('response', '')
+                    if piece:
+                        yield piece
+                    if chunk.get('done'):
+                        break
+        except requests.RequestException:
+            return
+
+    def chat_stream(self, model, messages, timeout=60):
+        """Yield chat response chunks with conversation history"""
+        try:
+            with self.session.post(
+                f"{self.base_url}/api/chat",
+                json={"model": model, "messages": messages, "stream": True,
+                      "keep_alive": self.keep_alive},
+                timeout=timeout,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    return
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    piece = chunk.get('message', {}).get('content', '')
+                    if piece:
+                        yield piece
+                    if chunk.get('done'):
+                        break
+        except requests.RequestException:
+            return
+
     def estimate_tokens(self, text):
         """Estimate token count (1 token ≈ 4 characters)"""
         return len(text) // 4
     
     def get_token_limit(self, model_name):
         """Get context window size for model"""
+        name = model_name.lower()
+        # Exact dict hit first (keys are lowercase), substring scan only
+        # for tagged variants like llama3.2:3b-instruct
+        limit = self.model_limits.get(name)
+        if limit is not None:
+            return limit
         for model_pattern, limit in self.model_limits.items():
-            if model_pattern in model_name.lower():
+            if model_pattern in name:
                 return limit
         return 4096  # Conservative default
     
@@ -76,11 +192,12 @@ class OllamaClient:
         """Check if prompt fits in context window"""
         tokens = self.estimate_tokens(prompt)
         limit = self.get_token_limit(model_name)
+        # Pure integer math: tokens < limit * 0.8 without the float round-trip
         return {
             "tokens": tokens,
             "limit": limit,
-            "fits": tokens < limit * 0.8,  # Leave room for response
-            "usage_percent": (tokens / limit) * 100
+            "fits": tokens * 5 < limit * 4,  # Leave room for response
+            "usage_percent": (tokens * 100) // limit
         }
 
 
@@ -115,11 +232,11 @@ def main():
         print("⚠️ Prompt might be too long for optimal response")
     
     print("Generating response...")
-    start = time.time()
+    start = time.perf_counter()
     response = client.generate(model_name, prompt)
     
     if response:
-        print(f"✅ Response ({time.time() - start:.1f}s): {response.strip()}")
+        print(f"✅ Response ({time.perf_counter() - start:.1f}s): {response.strip()}")
     else:
         print("❌ Generation failed")
 
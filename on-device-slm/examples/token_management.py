@@ -4,14 +4,31 @@ Check limits, count tokens, and manage context windows
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 
+# Optional exact tokenizer: trimming on real token ids never over- or
+# under-shoots the way char-count math does on code or non-English text
+try:
+    import tiktoken
+    _TOKEN_ENCODING = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _TOKEN_ENCODING = None
+
 
 class TokenManager:
     def __init__(self, base_url="http://localhost:11434"):
         self.base_url = base_url
+        # Pooled session shared by all lookups against the Ollama API
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+        # Memoized /api/show lookups and resolved context limits, so
+        # repeated check_prompt_size calls cost a dict lookup, not HTTP
+        self._model_info_cache = {}
+        self._context_limit_cache = {}
         # Approximate token limits for common models
         self.model_limits = {
             "llama3.2:3b": 8192,
@@ -24,24 +41,63 @@ class TokenManager:
         }
     
     def estimate_tokens(self, text: str) -> int:
-        """Rough token estimation (1 token ≈ 4 characters for English)"""
+        """Token estimate (exact BPE when tiktoken is installed, else len/4)"""
+        if _TOKEN_ENCODING is not None:
+            return len(_TOKEN_ENCODING.encode(text))
         return len(text) // 4
-    
+
+    def count_tokens(self, model_name: str, text: str) -> int:
+        """Exact token count from the server's own tokenizer
+
+        Runs a generate call with num_predict=0 so Ollama tokenizes the
+        prompt without producing output, and reads prompt_eval_count.
+        Falls back to the char heuristic when Ollama is unreachable.
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": model_name, "prompt": text, "stream": False,
+                      "options": {"num_predict": 0}},
+                timeout=30
+            )
+            if response.status_code == 200:
+                count = response.json().get('prompt_eval_count')
+                if count:
+                    return count
+        except requests.RequestException:
+            pass
+        return self.estimate_tokens(text)
+
     def get_model_info(self, model_name: str) -> Dict:
         """Get detailed model information including context window"""
+        cached = self._model_info_cache.get(model_name)
+        if cached is not None:
+            return cached
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/show",
                 json={"name": model_name}
             )
             if response.status_code == 200:
-                return response.json()
-        except:
+                info = response.json()
+                self._model_info_cache[model_name] = info
+                return info
+        except (requests.RequestException, ValueError):
             pass
+        # Failed lookups are not cached so a later call can retry
         return {}
     
     def get_context_limit(self, model_name: str) -> int:
-        """Get context window size for a model"""
+        """Get context window size for a model (memoized per model)"""
+        cached = self._context_limit_cache.get(model_name)
+        if cached is not None:
+            return cached
+        limit = self._resolve_context_limit(model_name)
+        self._context_limit_cache[model_name] = limit
+        return limit
+
+    def _resolve_context_limit(self, model_name: str) -> int:
+        """Work out the context window from model info or known limits"""
         # Try to get from model info first
         model_info = self.get_model_info(model_name)
         if model_info:
@@ -53,14 +109,19 @@ class TokenManager:
                     if 'num_ctx' in line:
                         try:
                             return int(line.split()[-1])
-                        except:
+                        except (ValueError, IndexError):
                             pass
         
-        # Fallback to known limits
+        # Fallback to known limits: exact dict hit first, then substring
+        # scan for tagged variants
+        name = model_name.lower()
+        limit = self.model_limits.get(name)
+        if limit is not None:
+            return limit
         for model_pattern, limit in self.model_limits.items():
-            if model_pattern in model_name.lower():
+            if model_pattern in name:
                 return limit
-        
+
         return 4096  # Conservative default
     
     def check_prompt_size(self, model_name: str, prompt: str) -> Dict:
@@ -68,34 +129,54 @@ class TokenManager:
         estimated_tokens = self.estimate_tokens(prompt)
         context_limit = self.get_context_limit(model_name)
         
+        # Pure integer math: tokens < limit * 0.8 without the float round-trip
         return {
             "estimated_tokens": estimated_tokens,
             "context_limit": context_limit,
-            "fits": estimated_tokens < context_limit * 0.8,  # Leave room for response
-            "usage_percent": (estimated_tokens / context_limit) * 100,
+            "fits": estimated_tokens * 5 < context_limit * 4,  # Leave room for response
+            "usage_percent": (estimated_tokens * 100) // context_limit,
             "tokens_remaining": context_limit - estimated_tokens
         }
     
     def truncate_prompt(self, prompt: str, max_tokens: int, keep_end: bool = True) -> str:
         """Truncate prompt to fit within token limit"""
+        if _TOKEN_ENCODING is not None:
+            # Slice real token ids and decode: the result fits exactly
+            token_ids = _TOKEN_ENCODING.encode(prompt)
+            if len(token_ids) <= max_tokens:
+                return prompt
+            kept = token_ids[-max_tokens:] if keep_end else token_ids[:max_tokens]
+            text = _TOKEN_ENCODING.decode(kept)
+            return "..." + text if keep_end else text + "..."
+
         estimated_tokens = self.estimate_tokens(prompt)
-        
+
         if estimated_tokens <= max_tokens:
             return prompt
-        
-        # Calculate characters to keep
-        chars_to_keep = max_tokens * 4  # Rough conversion
-        
+
+        # Heuristic fallback: chars ≈ tokens * 4, aligned to a whitespace
+        # boundary so the cut never lands mid-word
+        chars_to_keep = max_tokens * 4
+
         if keep_end:
-            return "..." + prompt[-chars_to_keep:]
-        else:
-            return prompt[:chars_to_keep] + "..."
+            tail = prompt[-chars_to_keep:]
+            cut = tail.find(' ')
+            if 0 < cut < 80:
+                tail = tail[cut + 1:]
+            return "..." + tail
+        head = prompt[:chars_to_keep]
+        cut = head.rfind(' ')
+        if cut > chars_to_keep - 80:
+            head = head[:cut]
+        return head + "..."
 
 
 class OllamaClientWithTokens:
     def __init__(self, base_url="http://localhost:11434"):
         self.base_url = base_url
         self.token_manager = TokenManager(base_url)
+        # Reuse the manager's pooled session for generation calls too
+        self.session = self.token_manager.session
     
     def generate_with_token_check(self, model: str, prompt: str, max_tokens: Optional[int] = None) -> Dict:
         """Generate text with automatic token limit checking"""
@@ -126,20 +207,38 @@ class OllamaClientWithTokens:
             if max_tokens:
                 generation_params["options"] = {"num_predict": max_tokens}
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json=generation_params,
                 timeout=120
             )
             
             if response.status_code == 200:
-                result["response"] = response.json().get('response', '')
-            
-        except Exception as e:
+                data = response.json()
+                result["response"] = data.get('response', '')
+                # Server-reported exact token counts (no char/4 math)
+                result["prompt_tokens"] = data.get('prompt_eval_count')
+                result["response_tokens"] = data.get('eval_count')
+
+        except requests.RequestException as e:
             result["error"] = str(e)
         
         return result
 
+    def generate_batch(self, model: str, prompts: List[str],
+                       max_tokens: Optional[int] = None, max_workers: int = 4) -> List[Dict]:
+        """Run several prompts concurrently
+
+        Ollama batches runnable requests in the same forward pass (up to
+        OLLAMA_NUM_PARALLEL), so submitting them together drops wall time
+        from the sum of latencies toward the slowest one.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda prompt: self.generate_with_token_check(model, prompt, max_tokens),
+                prompts
+            ))
+
 
 def demonstrate_token_limits():
     """Demonstrate token limit checking and management"""
@@ -147,28 +246,28 @@ def demonstrate_token_limits():
     
     client = OllamaClientWithTokens()
     model = "llama3.2:3b"
-    
+
+    prompt = "Explain the concept of machine learning in simple terms."
+    long_prompt = "Explain artificial intelligence. " * 1000  # Very long prompt
+
+    # Run both generation tests concurrently; wall time tracks the slower
+    result, long_result = client.generate_batch(model, [prompt, long_prompt])
+
     # Test 1: Normal prompt
     print("\n1️⃣ Normal Prompt Test")
-    prompt = "Explain the concept of machine learning in simple terms."
-    result = client.generate_with_token_check(model, prompt)
-    
     print(f"Tokens: {result['token_info']['estimated_tokens']}/{result['token_info']['context_limit']}")
     print(f"Usage: {result['token_info']['usage_percent']:.1f}%")
     print(f"Fits: {'✅' if result['token_info']['fits'] else '❌'}")
     
     if result["response"]:
-        response_tokens = client.token_manager.estimate_tokens(result["response"])
+        response_tokens = result.get("response_tokens") or client.token_manager.estimate_tokens(result["response"])
         print(f"Response tokens: {response_tokens}")
     
     # Test 2: Very long prompt
     print("\n2️⃣ Long Prompt Test")
-    long_prompt = "Explain artificial intelligence. " * 1000  # Very long prompt
-    result = client.generate_with_token_check(model, long_prompt)
-    
     print(f"Original tokens: {client.token_manager.estimate_tokens(long_prompt)}")
-    print(f"Final tokens: {result['token_info']['estimated_tokens']}")
-    print(f"Truncated: {'✅' if result['truncated'] else '❌'}")
+    print(f"Final tokens: {long_result['token_info']['estimated_tokens']}")
+    print(f"Truncated: {'✅' if long_result['truncated'] else '❌'}")
     
     # Test 3: Model limits comparison
     print("\n3️⃣ Model Limits Comparison")
@@ -185,11 +284,11 @@ def main():
     # Check if Ollama is running
     token_manager = TokenManager()
     try:
-        response = requests.get(f"{token_manager.base_url}/api/tags", timeout=5)
+        response = token_manager.session.get(f"{token_manager.base_url}/api/tags", timeout=5)
         if response.status_code != 200:
             print("❌ Ollama not running")
             return
-    except:
+    except requests.RequestException:
         print("❌ Ollama not running")
         return
     
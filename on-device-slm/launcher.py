@@ -4,7 +4,12 @@ Launcher for On-Device LLM Assistant
 Starts the FastAPI backend and opens the application
 """
 
+import importlib.metadata
+import importlib.util
+import re
+import socket
 import subprocess
+import threading
 import webbrowser
 import time
 import sys
@@ -20,12 +25,33 @@ def check_ollama():
     except:
         return False
 
+def requirements_satisfied(requirements_file):
+    """True when every requirement in the file is already installed
+
+    A metadata presence check costs microseconds per package, versus the
+    3-30s resolver + network pass pip pays even when nothing changes.
+    Version specifiers are left to pip on the runs where it does fire.
+    """
+    for line in requirements_file.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name = re.split(r"[\s\[<>=!~;]", line, 1)[0]
+        try:
+            importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            return False
+    return True
+
 def install_dependencies():
     """Install required dependencies"""
     print("📦 Installing dependencies...")
     requirements_file = Path(__file__).parent / "requirements.txt"
     
     if requirements_file.exists():
+        if requirements_satisfied(requirements_file):
+            print("✅ Dependencies already installed!")
+            return True
         subprocess.run([
             sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
         ], check=True)
@@ -36,26 +62,32 @@ def install_dependencies():
     return True
 
 def start_backend():
-    """Start the FastAPI backend server"""
+    """Start the FastAPI backend server in this process
+
+    Returns (server, thread), or (None, None) when the backend is missing.
+    """
     backend_dir = Path(__file__).parent / "backend"
     main_file = backend_dir / "main.py"
     
     if not main_file.exists():
         print("❌ Backend main.py not found!")
-        return None
+        return None, None
     
     print("🚀 Starting FastAPI backend...")
     os.chdir(backend_dir)
+    sys.path.insert(0, str(backend_dir))
+    
+    # Serve from this interpreter: a uvicorn subprocess re-pays Python
+    # startup plus the whole FastAPI import chain, and --reload forks a
+    # watcher process on top (use RELOAD=1 python backend/main.py for dev)
+    import uvicorn
+    from main import app
     
-    # Start FastAPI server
-    process = subprocess.Popen([
-        sys.executable, "-m", "uvicorn", "main:app",
-        "--host", "127.0.0.1",
-        "--port", "8000",
-        "--reload"
-    ])
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=8000))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
     
-    return process
+    return server, thread
 
 def warning_mark(message):
     """Print warning symbol"""
@@ -67,13 +99,27 @@ def info_mark(message):
 
 def check_dependencies():
     """Check if all dependencies are installed"""
-    try:
-        import fastapi
-        import uvicorn
-        import requests
-        return True
-    except ImportError:
-        return False
+    # find_spec only stats the filesystem; importing fastapi here would
+    # execute the whole starlette/pydantic chain just to answer yes/no.
+    # The real imports happen once, in start_backend.
+    return all(importlib.util.find_spec(module) is not None
+               for module in ("fastapi", "uvicorn", "requests"))
+
+def wait_for_server(host="127.0.0.1", port=8000, timeout=10.0):
+    """Poll until the backend socket accepts connections
+
+    Replaces a fixed sleep: the browser opens as soon as uvicorn binds
+    (often under half a second) instead of always paying the worst case,
+    and slow machines get the full timeout instead of a premature open.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
 
 def check_frontend_build():
     """Check if frontend is built"""
@@ -138,13 +184,14 @@ def main():
         print()
     
     # Start backend
-    backend_process = start_backend()
-    if not backend_process:
+    backend_server, backend_thread = start_backend()
+    if not backend_server:
         return
     
     # Wait for server to start
     print("⏳ Waiting for server to start...")
-    time.sleep(3)
+    if not wait_for_server():
+        warning_mark("Server not responding yet, opening browser anyway")
     
     # Open browser
     url = "http://localhost:8000"
@@ -159,11 +206,11 @@ def main():
     
     try:
         # Keep the launcher running
-        backend_process.wait()
+        backend_thread.join()
     except KeyboardInterrupt:
         print("\n🛑 Shutting down...")
-        backend_process.terminate()
-        backend_process.wait()
+        backend_server.should_exit = True
+        backend_thread.join()
         print("✅ Server stopped")
 
 if __name__ == "__main__":
@@ -14,8 +14,13 @@ import json
 import urllib.request
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# uname()/registry probes behind platform.system() aren't free and the
+# answer never changes mid-run; resolve it once at import
+_SYSTEM = platform.system()
+
 def print_banner():
     """Print setup banner"""
     print("""
@@ -27,7 +32,7 @@ def print_banner():
 
 def is_admin():
     """Check if running with admin privileges on Windows"""
-    if platform.system() == "Windows":
+    if _SYSTEM == "Windows":
         try:
             import ctypes
             return ctypes.windll.shell32.IsUserAnAdmin()
@@ -37,7 +42,7 @@ def is_admin():
 
 def run_as_admin():
     """Restart script with admin privileges on Windows"""
-    if platform.system() == "Windows":
+    if _SYSTEM == "Windows":
         import ctypes
         if not is_admin():
             print("🔑 Administrator privileges required for Ollama installation...")
@@ -48,17 +53,77 @@ def run_as_admin():
             )
             sys.exit(0)
 
+RANGE_WORKERS = 4
+MIN_RANGE_SIZE = 8 << 20  # Below ~8MB parallel ranges aren't worth the setup
+DOWNLOAD_BLOCK = 1 << 20  # 1MB reads: fewer syscalls than the 8KB default
+PROGRESS_STEP = 16 << 20  # Report progress every 16MB, not every block
+
+def _probe_download(url):
+    """HEAD the URL; returns (content_length, supports_range_requests)"""
+    request = urllib.request.Request(url, method="HEAD")
+    with urllib.request.urlopen(request, timeout=15) as response:
+        size = int(response.headers.get("Content-Length") or 0)
+        ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+    return size, ranges
+
+def _download_stream(url, dest_path, total_size):
+    """Single-connection download with progress indication"""
+    downloaded = 0
+    next_report = PROGRESS_STEP
+    with urllib.request.urlopen(url) as response, open(dest_path, "wb") as out:
+        while True:
+            block = response.read(DOWNLOAD_BLOCK)
+            if not block:
+                break
+            out.write(block)
+            downloaded += len(block)
+            if total_size > 0 and downloaded >= next_report:
+                next_report = downloaded + PROGRESS_STEP
+                percent = (downloaded / total_size) * 100
+                print(f"\r   Progress: {percent:.1f}%", end="", flush=True)
+
+def _download_ranges(url, dest_path, total_size):
+    """Download via concurrent Range requests into a preallocated file
+
+    Each worker holds its own handle and writes at its span's offset, so
+    the parts land in place with no reassembly pass afterwards.
+    """
+    span_size = -(-total_size // RANGE_WORKERS)
+    spans = [(lo, min(lo + span_size, total_size) - 1)
+             for lo in range(0, total_size, span_size)]
+    
+    with open(dest_path, "wb") as out:
+        out.truncate(total_size)
+    
+    def fetch(span):
+        lo, hi = span
+        request = urllib.request.Request(url, headers={"Range": f"bytes={lo}-{hi}"})
+        with urllib.request.urlopen(request) as response, open(dest_path, "r+b") as out:
+            out.seek(lo)
+            shutil.copyfileobj(response, out, length=DOWNLOAD_BLOCK)
+        return hi - lo + 1
+    
+    downloaded = 0
+    with ThreadPoolExecutor(max_workers=len(spans)) as pool:
+        for fetched in pool.map(fetch, spans):
+            downloaded += fetched
+            percent = (downloaded / total_size) * 100
+            print(f"\r   Progress: {percent:.1f}%", end="", flush=True)
+
 def download_file(url, dest_path, description="file"):
-    """Download a file with progress indication"""
+    """Download a file, splitting into parallel ranges when the server allows"""
     print(f"📥 Downloading {description}...")
     
-    def progress_hook(block_num, block_size, total_size):
-        if total_size > 0:
-            percent = (block_num * block_size / total_size) * 100
-            print(f"\r   Progress: {percent:.1f}%", end="", flush=True)
-    
     try:
-        urllib.request.urlretrieve(url, dest_path, progress_hook)
+        try:
+            total_size, supports_ranges = _probe_download(url)
+        except (OSError, ValueError):
+            total_size, supports_ranges = 0, False
+        
+        if supports_ranges and total_size >= MIN_RANGE_SIZE:
+            _download_ranges(url, dest_path, total_size)
+        else:
+            _download_stream(url, dest_path, total_size)
         print("\n✅ Download completed")
         return True
     except Exception as e:
@@ -72,9 +137,12 @@ def install_ollama_windows():
     # Try winget first (modern Windows package manager)
     try:
         print("📦 Trying winget installation...")
-        result = subprocess.run([
+        # Output is never read; DEVNULL skips piping winget's megabytes
+        # of progress text through Python just to drop them
+        subprocess.run([
             "winget", "install", "Ollama.Ollama", "--accept-package-agreements", "--accept-source-agreements"
-        ], check=True, capture_output=True, text=True)
+        ], check=True, stdin=subprocess.DEVNULL,
+           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         print("✅ Ollama installed successfully via winget")
         
         # Wait a moment and verify
@@ -95,12 +163,13 @@ def install_ollama_windows():
         
         print("🔧 Running Ollama installer...")
         try:
-            # Run installer silently
-            result = subprocess.run([
+            # Run installer silently; its output is discarded either way
+            subprocess.run([
                 str(installer_path), 
                 "/S",  # Silent install
                 "/D=C:\\Program Files\\Ollama"  # Default directory
-            ], check=True, capture_output=True, text=True)
+            ], check=True, stdin=subprocess.DEVNULL,
+               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             
             print("✅ Ollama installed successfully")
             
@@ -141,52 +210,56 @@ def install_ollama_windows():
             print("⚠️  Note: Admin privileges may be required for installation")
             print("   Please run PowerShell as Administrator and try again")
             return False
-            
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Installation failed: {e}")
-            print("⚠️  Note: Admin privileges may be required for installation")
-            print("   Please run PowerShell as Administrator and try again")
-            return False
 
 def install_ollama_macos():
     """Automatically install Ollama on macOS"""
     print("\n🤖 Installing Ollama for macOS...")
     
-    # Try Homebrew first
-    try:
-        subprocess.run(["brew", "--version"], check=True, capture_output=True)
-        print("🍺 Using Homebrew to install Ollama...")
-        subprocess.run(["brew", "install", "ollama"], check=True)
-        print("✅ Ollama installed via Homebrew")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    # Try Homebrew first (shutil.which walks PATH in-process, no fork
+    # just to see whether the manager exists)
+    if shutil.which("brew"):
+        try:
+            print("🍺 Using Homebrew to install Ollama...")
+            subprocess.run(["brew", "install", "ollama"], check=True)
+            print("✅ Ollama installed via Homebrew")
+            return True
+        except subprocess.CalledProcessError:
+            print("📥 Homebrew install failed, trying direct installation...")
+    else:
         print("📥 Homebrew not available, trying direct installation...")
     
     # Try MacPorts
-    try:
-        subprocess.run(["port", "version"], check=True, capture_output=True)
-        print("🚢 Using MacPorts to install Ollama...")
-        subprocess.run(["sudo", "port", "install", "ollama"], check=True)
-        print("✅ Ollama installed via MacPorts")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    if shutil.which("port"):
+        try:
+            print("🚢 Using MacPorts to install Ollama...")
+            subprocess.run(["sudo", "port", "install", "ollama"], check=True)
+            print("✅ Ollama installed via MacPorts")
+            return True
+        except subprocess.CalledProcessError:
+            print("📥 MacPorts install failed, trying direct download...")
+    else:
         print("📥 MacPorts not available, trying direct download...")
     
     # Fallback to manual installation
     with tempfile.TemporaryDirectory() as temp_dir:
-        zip_path = Path(temp_dir) / "ollama-darwin.zip"
-        
-        # Download Ollama for macOS
         ollama_url = "https://ollama.ai/download/Ollama-darwin.zip"
-        if not download_file(ollama_url, zip_path, "Ollama for macOS"):
-            return False
         
-        print("📦 Extracting Ollama...")
+        print("📥 Downloading Ollama for macOS...")
         try:
-            # Extract and install
             import zipfile
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
+            # The ZIP central directory sits at end-of-file, so extraction
+            # cannot start before the download completes; what can be cut
+            # is the write-to-disk-then-reopen round trip. Spool the
+            # archive (memory first, disk past 64MB) and unzip from it.
+            with tempfile.SpooledTemporaryFile(max_size=64 << 20) as spooled:
+                with urllib.request.urlopen(ollama_url) as response:
+                    shutil.copyfileobj(response, spooled, length=1 << 20)
+                print("✅ Download completed")
+                
+                print("📦 Extracting Ollama...")
+                spooled.seek(0)
+                with zipfile.ZipFile(spooled) as zip_ref:
+                    zip_ref.extractall(temp_dir)
             
             # Move to Applications
             print("🔧 Installing to /Applications...")
@@ -194,8 +267,14 @@ def install_ollama_macos():
             if app_path.exists():
                 dest_path = Path("/Applications/Ollama.app")
                 if dest_path.exists():
-                    subprocess.run(["rm", "-rf", str(dest_path)], check=True)
-                subprocess.run(["mv", str(app_path), "/Applications/"], check=True)
+                    shutil.rmtree(dest_path)
+                try:
+                    # Same-volume rename is one syscall; the tempdir and
+                    # /Applications normally share the root volume
+                    os.rename(app_path, dest_path)
+                except OSError:
+                    # Cross-device fallback (e.g. tempdir on another volume)
+                    shutil.move(str(app_path), str(dest_path))
                 
                 # Create CLI symlink
                 cli_source = Path("/Applications/Ollama.app/Contents/Resources/ollama")
@@ -223,21 +302,23 @@ def install_ollama_linux():
     print("\n🤖 Installing Ollama for Linux...")
     
     try:
-        # Use the official install script
+        # Use the official install script, piped kernel-to-kernel: curl's
+        # stdout feeds sh directly instead of being buffered and decoded
+        # in Python between two sequential runs
         print("📥 Downloading and running Ollama install script...")
-        result = subprocess.run([
-            "curl", "-fsSL", "https://ollama.ai/install.sh"
-        ], capture_output=True, text=True, check=True)
-        
-        # Pipe to sh
-        install_process = subprocess.run([
-            "sh"
-        ], input=result.stdout, text=True, check=True)
+        curl = subprocess.Popen(
+            ["curl", "-fsSL", "https://ollama.ai/install.sh"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE)
+        sh = subprocess.Popen(["sh"], stdin=curl.stdout)
+        curl.stdout.close()  # Let sh see EOF/SIGPIPE if curl dies
+        if sh.wait() != 0 or curl.wait() != 0:
+            print("❌ Installation failed: install script returned an error")
+            return False
         
         print("✅ Ollama installed successfully")
         return True
         
-    except subprocess.CalledProcessError as e:
+    except OSError as e:
         print(f"❌ Installation failed: {e}")
         return False
 
@@ -245,7 +326,7 @@ def start_ollama_service():
     """Start Ollama service and wait for it to be ready"""
     print("\n🚀 Starting Ollama service...")
     
-    system = platform.system().lower()
+    system = _SYSTEM.lower()
     
     # Find the correct Ollama executable
     ollama_cmd = find_ollama_executable()
@@ -254,16 +335,19 @@ def start_ollama_service():
         return False
     
     try:
+        # stdin=DEVNULL everywhere: the service never reads input, and
+        # not inheriting the terminal fd lets it skip interactive probes
         if system == "windows":
             # On Windows, start in a new console window
             subprocess.Popen([
                 ollama_cmd, "serve"
-            ], creationflags=subprocess.CREATE_NEW_CONSOLE)
+            ], stdin=subprocess.DEVNULL, creationflags=subprocess.CREATE_NEW_CONSOLE)
         else:
             # On Unix systems, start in background
             subprocess.Popen([
                 ollama_cmd, "serve"
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            ], stdin=subprocess.DEVNULL,
+               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         
         # Wait for service to be ready
         print("⏳ Waiting for Ollama service to start...")
@@ -285,23 +369,36 @@ def start_ollama_service():
         print(f"⚠️  Could not start Ollama service: {e}")
         return False
 
-def find_ollama_executable():
-    """Find the Ollama executable in various locations"""
-    possible_paths = [
+def ollama_candidate_paths():
+    """Candidate Ollama locations that actually exist on this machine
+
+    Presence is resolved with shutil.which / a stat per absolute path, so
+    callers only ever spawn a subprocess against a real executable instead
+    of paying a failed fork per missing candidate.
+    """
+    candidates = [
         "ollama",  # If in PATH
         "C:\\Program Files\\Ollama\\ollama.exe",
         "C:\\Users\\{}\\AppData\\Local\\Programs\\Ollama\\ollama.exe".format(os.getenv("USERNAME", "")),
         "/usr/local/bin/ollama",
-        "/opt/homebrew/bin/ollama", 
+        "/opt/homebrew/bin/ollama",
         "/Applications/Ollama.app/Contents/Resources/ollama"
     ]
-    
-    for ollama_path in possible_paths:
+    existing = []
+    for candidate in candidates:
+        resolved = shutil.which(candidate) if os.sep not in candidate else candidate
+        if resolved and Path(resolved).is_file():
+            existing.append(candidate)
+    return existing
+
+def find_ollama_executable():
+    """Find the Ollama executable in various locations"""
+    for ollama_path in ollama_candidate_paths():
         try:
-            result = subprocess.run([ollama_path, "--version"], 
-                                  capture_output=True, text=True, check=True, timeout=5)
+            subprocess.run([ollama_path, "--version"],
+                           capture_output=True, text=True, check=True, timeout=5)
             return ollama_path
-        except:
+        except (subprocess.CalledProcessError, OSError, subprocess.TimeoutExpired):
             continue
     
     return None
@@ -333,7 +430,8 @@ def download_recommended_models():
             # Start the download process
             process = subprocess.Popen([
                 ollama_cmd, "pull", model_name
-            ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+            ], stdin=subprocess.DEVNULL,
+               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
             
             # Show progress
             while True:
@@ -366,7 +464,7 @@ def download_recommended_models():
 
 def install_ollama_automatically():
     """Automatically install Ollama based on the operating system"""
-    system = platform.system().lower()
+    system = _SYSTEM.lower()
     
     if system == "windows":
         return install_ollama_windows()
@@ -437,7 +535,7 @@ def create_enhanced_startup_scripts():
     project_root = Path(__file__).parent
     
     # Enhanced Windows batch file
-    if platform.system() == "Windows":
+    if _SYSTEM == "Windows":
         batch_content = """@echo off
 echo Starting On-Device LLM Assistant...
 cd /d "%~dp0"
@@ -486,7 +584,7 @@ python launcher.py
         f.write(bash_content)
     
     # Make shell script executable
-    if platform.system() != "Windows":
+    if _SYSTEM != "Windows":
         os.chmod(project_root / "start.sh", 0o755)
         print("✅ Created enhanced start.sh")
 
@@ -513,7 +611,7 @@ def check_system_requirements():
     
     # Check npm (improved detection)
     try:
-        if platform.system() == "Windows":
+        if _SYSTEM == "Windows":
             # Try PowerShell npm first
             result = subprocess.run(["powershell", "-Command", "npm --version"], capture_output=True, text=True, check=True)
         else:
@@ -554,7 +652,7 @@ def setup_python_environment():
         print("✅ Virtual environment exists")
     
     # Determine activation script
-    if platform.system() == "Windows":
+    if _SYSTEM == "Windows":
         pip_path = venv_path / "Scripts" / "pip.exe"
         python_path = venv_path / "Scripts" / "python.exe"
     else:
@@ -579,33 +677,28 @@ def setup_frontend():
         print("❌ Frontend directory not found")
         return False
     
-    current_dir = os.getcwd()
-    os.chdir(frontend_path)
-    
-    try:
-        # Install npm dependencies
-        if (frontend_path / "package.json").exists():
-            print("Installing npm dependencies...")
-            if platform.system() == "Windows":
-                subprocess.run(["powershell", "-Command", "npm install"], check=True)
-            else:
-                subprocess.run(["npm", "install"], check=True)
-            print("✅ npm dependencies installed")
-            
-            # Build frontend
-            print("Building frontend...")
-            if platform.system() == "Windows":
-                subprocess.run(["powershell", "-Command", "npm run build"], check=True)
-            else:
-                subprocess.run(["npm", "run", "build"], check=True)
-            print("✅ Frontend built successfully")
-            
-            return True
+    # cwd= per subprocess instead of os.chdir: the working directory is
+    # process-global, and this runs concurrently with the Python setup
+    if (frontend_path / "package.json").exists():
+        print("Installing npm dependencies...")
+        if _SYSTEM == "Windows":
+            subprocess.run(["powershell", "-Command", "npm install"], check=True, cwd=frontend_path)
         else:
-            print("❌ package.json not found")
-            return False
-    finally:
-        os.chdir(current_dir)
+            subprocess.run(["npm", "install"], check=True, cwd=frontend_path)
+        print("✅ npm dependencies installed")
+        
+        # Build frontend
+        print("Building frontend...")
+        if _SYSTEM == "Windows":
+            subprocess.run(["powershell", "-Command", "npm run build"], check=True, cwd=frontend_path)
+        else:
+            subprocess.run(["npm", "run", "build"], check=True, cwd=frontend_path)
+        print("✅ Frontend built successfully")
+        
+        return True
+    else:
+        print("❌ package.json not found")
+        return False
 
 def create_development_guide():
     """Create a quick development guide"""
@@ -669,17 +762,8 @@ def verify_ollama_installation():
     """Verify that Ollama is properly installed and accessible"""
     print("🔍 Verifying Ollama installation...")
     
-    # Try different possible locations
-    possible_paths = [
-        "ollama",  # If in PATH
-        "C:\\Program Files\\Ollama\\ollama.exe",
-        "C:\\Users\\{}\\AppData\\Local\\Programs\\Ollama\\ollama.exe".format(os.getenv("USERNAME", "")),
-        "/usr/local/bin/ollama",
-        "/opt/homebrew/bin/ollama",
-        "/Applications/Ollama.app/Contents/Resources/ollama"
-    ]
-    
-    for ollama_path in possible_paths:
+    # Try the candidate locations that exist on this machine
+    for ollama_path in ollama_candidate_paths():
         try:
             result = subprocess.run([ollama_path, "--version"], 
                                   capture_output=True, text=True, check=True, timeout=10)
@@ -708,7 +792,7 @@ def main():
     print_banner()
     
     # Check for admin privileges on Windows if needed
-    if platform.system() == "Windows":
+    if _SYSTEM == "Windows":
         print("ℹ️  Note: Admin privileges may be required for Ollama installation")
     
     # Check system requirements (now self-contained)
@@ -740,13 +824,14 @@ def main():
         print("✅ Ollama is ready with models available!")
     
     try:
-        # Setup Python environment
-        python_path, pip_path = setup_python_environment()
-        
-        # Setup frontend
-        current_dir = os.getcwd()
-        frontend_success = setup_frontend()
-        os.chdir(current_dir)
+        # pip and npm touch disjoint trees (venv/ vs frontend/), so the
+        # Python environment and the frontend install+build run
+        # concurrently; this phase costs the slower of the two
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            python_future = pool.submit(setup_python_environment)
+            frontend_future = pool.submit(setup_frontend)
+            python_path, pip_path = python_future.result()
+            frontend_success = frontend_future.result()
         
         # Create enhanced startup scripts
         create_enhanced_startup_scripts()
@@ -758,7 +843,7 @@ def main():
         print("🎉 Enhanced setup completed successfully!")
         print("="*60)
         print("\n🚀 To start the application:")
-        if platform.system() == "Windows":
+        if _SYSTEM == "Windows":
             print("   Double-click: start.bat")
         else:
             print("   Run: ./start.sh")
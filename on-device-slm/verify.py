@@ -8,8 +8,30 @@ import subprocess
 import sys
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+_version_cache = {}
+
+def get_version(cmd):
+    """Return `cmd --version` output, or None when unavailable (cached)"""
+    if cmd not in _version_cache:
+        try:
+            result = subprocess.run([cmd, "--version"], capture_output=True, text=True, check=True)
+            _version_cache[cmd] = result.stdout.strip()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            _version_cache[cmd] = None
+    return _version_cache[cmd]
+
+def prefetch_versions(commands=("node", "npm", "ollama", "git")):
+    """Warm the version cache by probing all commands concurrently
+
+    Each probe is fork/exec-bound, so running them in threads makes this
+    phase cost one probe's wall time instead of four in a row.
+    """
+    with ThreadPoolExecutor(max_workers=len(commands)) as pool:
+        list(pool.map(get_version, commands))
+
 def print_header(title):
     """Print a formatted header"""
     print(f"\n{'='*60}")
@@ -75,25 +97,21 @@ def check_node_environment():
     print_header("Node.js Environment")
     
     # Check Node.js
-    try:
-        result = subprocess.run(["node", "--version"], capture_output=True, text=True, check=True)
-        node_version = result.stdout.strip()
+    node_version = get_version("node")
+    node_ok = node_version is not None
+    if node_ok:
         check_mark(True, f"Node.js {node_version}")
-        node_ok = True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    else:
         check_mark(False, "Node.js not found")
         info_mark("Install from: https://nodejs.org")
-        node_ok = False
     
     # Check npm
-    try:
-        result = subprocess.run(["npm", "--version"], capture_output=True, text=True, check=True)
-        npm_version = result.stdout.strip()
+    npm_version = get_version("npm")
+    npm_ok = npm_version is not None
+    if npm_ok:
         check_mark(True, f"npm {npm_version}")
-        npm_ok = True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    else:
         check_mark(False, "npm not found")
-        npm_ok = False
     
     # Check frontend dependencies
     frontend_path = Path("frontend")
@@ -128,12 +146,10 @@ def check_ollama():
     print_header("Ollama Environment")
     
     # Check Ollama command
-    try:
-        result = subprocess.run(["ollama", "--version"], capture_output=True, text=True, check=True)
-        ollama_version = result.stdout.strip()
+    ollama_version = get_version("ollama")
+    if ollama_version is not None:
         check_mark(True, f"Ollama {ollama_version}")
-        ollama_installed = True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    else:
         check_mark(False, "Ollama command not found")
         info_mark("Install from: https://ollama.ai")
         return False
@@ -230,11 +246,10 @@ def check_development_setup():
     print_header("Development Setup")
     
     # Check if git is available
-    try:
-        result = subprocess.run(["git", "--version"], capture_output=True, text=True, check=True)
-        git_version = result.stdout.strip()
+    git_version = get_version("git")
+    if git_version is not None:
         check_mark(True, f"{git_version}")
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    else:
         check_mark(False, "Git not found")
         warning_mark("Git is recommended for development")
     
@@ -257,6 +272,10 @@ def main():
 ╚══════════════════════════════════════════════════════════════╝
 """)
     
+    # Probe every external command up front, in parallel, so the serial
+    # report below reads answers from the cache
+    prefetch_versions()
+    
     results = {
         'python': check_python_environment(),
         'node': check_node_environment(),